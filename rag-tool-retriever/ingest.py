@@ -28,6 +28,12 @@ except ImportError as e:
     print(f"Import error: {e}")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - stdlib json is the fallback
+    orjson = None
+
 # Local imports
 from tool_definitions import ToolStandardizer, create_sample_tools
 
@@ -38,6 +44,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# HNSW tuning for the tool-retrieval workload: cosine space over the
+# normalized embeddings, graph parameters sized for frequent queries
+# against a small, mostly static corpus
+_HNSW_COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 50,
+}
+
 class ToolIngestionPipeline:
     """Pipeline for ingesting tools into ChromaDB for RAG retrieval"""
 
@@ -63,21 +79,57 @@ class ToolIngestionPipeline:
         if self.embedding_model is None:
             logger.info("Initializing nomic-embed-text-v1.5 embedding model...")
 
+            # Run the encoder on GPU when one is present - the embedding
+            # forward pass dominates ingestion time and a GPU takes much
+            # larger batches
+            try:
+                import torch
+                device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            except ImportError:
+                device = 'cpu'
+
+            logger.info(f"Embedding on device: {device}")
+
+            # Encode tool descriptions in mini-batches so ingestion runs
+            # one batched forward pass per batch instead of N serial ones.
+            # Unit-normalized vectors reduce distance computation to a dot
+            # product; the retriever normalizes queries the same way
+            encode_kwargs = {
+                'batch_size': 128 if device == 'cuda' else 64,
+                'show_progress_bar': False,
+                'normalize_embeddings': True
+            }
+
             try:
                 self.embedding_model = HuggingFaceEmbeddings(
                     model_name="nomic-ai/nomic-embed-text-v1.5",
-                    model_kwargs={'trust_remote_code': True}
+                    model_kwargs={'trust_remote_code': True, 'device': device},
+                    encode_kwargs=encode_kwargs
                 )
                 logger.info("Successfully initialized embedding model")
             except Exception as e:
                 logger.error(f"Failed to initialize embedding model: {e}")
                 logger.info("Falling back to sentence-transformers/all-MiniLM-L6-v2")
                 self.embedding_model = HuggingFaceEmbeddings(
-                    model_name="sentence-transformers/all-MiniLM-L6-v2"
+                    model_name="sentence-transformers/all-MiniLM-L6-v2",
+                    model_kwargs={'device': device},
+                    encode_kwargs=encode_kwargs
                 )
 
         return self.embedding_model
 
+    @staticmethod
+    def _tool_category(tool) -> str:
+        """
+        Derive a coarse category for metadata pre-filtering
+
+        Prefixed metaMCP names ("filesystem__read_file") carry the category
+        directly; otherwise fall back to the source server name.
+        """
+        if '__' in tool.name:
+            return tool.name.split('__', 1)[0]
+        return (tool.server_source or 'unknown').split()[0].lower()
+
     def load_tools_from_metamcp_json(self, json_file_path: str) -> None:
         """
         Load tools from a metaMCP tools JSON file
@@ -88,8 +140,9 @@ class ToolIngestionPipeline:
         logger.info(f"Loading tools from metaMCP JSON file: {json_file_path}")
 
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                tools_data = json.load(f)
+            with open(json_file_path, 'rb') as f:
+                raw = f.read()
+            tools_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
             if isinstance(tools_data, list):
                 self.standardizer.load_from_metamcp_format(tools_data)
@@ -144,7 +197,8 @@ class ToolIngestionPipeline:
         """Load sample tools for testing"""
         logger.info("Loading sample tools for testing...")
         sample_tools = create_sample_tools()
-        self.standardizer.tools.extend(sample_tools)
+        for tool in sample_tools:
+            self.standardizer.add_standardized_tool(tool)
         logger.info(f"Loaded {len(sample_tools)} sample tools")
 
     def create_vector_store(self, collection_name: str = "metamcp_tools") -> None:
@@ -170,10 +224,12 @@ class ToolIngestionPipeline:
         documents = []
         metadatas = []
 
-        for i, (desc, meta) in enumerate(zip(descriptions, metadata)):
+        for i, (tool, desc, meta) in enumerate(zip(self.standardizer.tools,
+                                                   descriptions, metadata)):
             documents.append(desc)
             metadatas.append({
                 **meta,
+                "category": self._tool_category(tool),
                 "tool_index": i,
                 "collection": collection_name
             })
@@ -187,7 +243,8 @@ class ToolIngestionPipeline:
                 embedding=embeddings,
                 metadatas=metadatas,
                 persist_directory=self.persist_directory,
-                collection_name=collection_name
+                collection_name=collection_name,
+                collection_metadata=_HNSW_COLLECTION_METADATA
             )
 
             # Persist the database
@@ -230,7 +287,8 @@ class ToolIngestionPipeline:
                 self.vector_store = Chroma(
                     persist_directory=self.persist_directory,
                     embedding_function=embeddings,
-                    collection_name=collection_name
+                    collection_name=collection_name,
+                    collection_metadata=_HNSW_COLLECTION_METADATA
                 )
                 logger.info("Loaded existing vector store")
             else:
@@ -240,9 +298,11 @@ class ToolIngestionPipeline:
 
             # Add new documents
             new_metadatas = []
-            for i, meta in enumerate(new_metadata):
+            new_standardized = self.standardizer.tools[-new_count:]
+            for i, (tool, meta) in enumerate(zip(new_standardized, new_metadata)):
                 new_metadatas.append({
                     **meta,
+                    "category": self._tool_category(tool),
                     "tool_index": original_count + i,
                     "collection": collection_name
                 })
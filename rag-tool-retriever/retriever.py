@@ -5,8 +5,10 @@ This module provides dynamic tool retrieval based on semantic similarity
 to user queries, replacing static tool loading with intelligent selection.
 """
 
+import functools
 import logging
 import os
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
@@ -28,6 +30,30 @@ from tool_definitions import ToolStandardizer
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Query words that map unambiguously onto a tool category. Matching the
+# ingestion-time "category" metadata lets the vector search pre-filter
+# its candidate set instead of scanning every indexed tool.
+_CATEGORY_KEYWORDS = {
+    "file": "filesystem", "files": "filesystem", "directory": "filesystem",
+    "directories": "filesystem", "folder": "filesystem",
+    "git": "git", "commit": "git", "branch": "git", "repository": "git",
+    "browser": "browser", "browse": "browser", "click": "browser",
+    "navigate": "browser", "webpage": "browser",
+    "email": "email", "emails": "email", "inbox": "email",
+    "database": "database", "sql": "database",
+    "api": "api", "http": "api", "graphql": "api", "endpoint": "api",
+    "shell": "system", "cpu": "system",
+}
+
+def _infer_query_category(query: str) -> Optional[str]:
+    """Map a query onto a single tool category, or None when ambiguous"""
+    categories = {_CATEGORY_KEYWORDS[word]
+                  for word in query.lower().split()
+                  if word in _CATEGORY_KEYWORDS}
+    if len(categories) == 1:
+        return categories.pop()
+    return None
+
 class ToolRetriever:
     """
     Dynamic tool retriever using semantic similarity for metaMCP agents
@@ -38,7 +64,8 @@ class ToolRetriever:
 
     def __init__(self, persist_directory: str = "./chroma_db",
                  collection_name: str = "metamcp_tools",
-                 default_k: int = 5):
+                 default_k: int = 5,
+                 client: Optional[Any] = None):
         """
         Initialize the tool retriever
 
@@ -46,15 +73,26 @@ class ToolRetriever:
             persist_directory: Directory containing the ChromaDB database
             collection_name: Name of the ChromaDB collection
             default_k: Default number of tools to retrieve
+            client: Optional pre-built chromadb client; sharing one across
+                retrievers avoids re-reading the index from disk
         """
         self.persist_directory = persist_directory
         self.collection_name = collection_name
         self.default_k = default_k
+        self.client = client
         self.embedding_model = None
         self.vector_store = None
         self.tool_registry = {}  # Maps tool names to actual tool objects
         self.fallback_tools = []  # Core tools for fallback
 
+        # Serializes lazy init so concurrent callers don't each load
+        # their own copy of the embedding model / vector store
+        self._init_lock = threading.Lock()
+
+        # Per-instance query-embedding cache: the embedding forward pass
+        # dominates retrieval latency, so repeated queries skip it
+        self._embed_query_cached = functools.lru_cache(maxsize=1024)(self._embed_query)
+
         # Validate database exists
         self._validate_database()
 
@@ -77,40 +115,60 @@ class ToolRetriever:
     def _init_embeddings(self) -> HuggingFaceEmbeddings:
         """Initialize the same embedding model used for ingestion"""
         if self.embedding_model is None:
-            logger.debug("Initializing embedding model for retrieval...")
-
-            try:
-                self.embedding_model = HuggingFaceEmbeddings(
-                    model_name="nomic-ai/nomic-embed-text-v1.5",
-                    model_kwargs={'trust_remote_code': True}
-                )
-            except Exception as e:
-                logger.warning(f"Failed to load nomic-embed-text-v1.5: {e}")
-                logger.info("Falling back to sentence-transformers/all-MiniLM-L6-v2")
-                self.embedding_model = HuggingFaceEmbeddings(
-                    model_name="sentence-transformers/all-MiniLM-L6-v2"
-                )
+            with self._init_lock:
+                if self.embedding_model is not None:
+                    return self.embedding_model
+
+                logger.debug("Initializing embedding model for retrieval...")
+
+                # Unit-normalized vectors let the index compare by dot product,
+                # which is the cheapest distance kernel; must match ingestion
+                encode_kwargs = {'normalize_embeddings': True}
+
+                try:
+                    self.embedding_model = HuggingFaceEmbeddings(
+                        model_name="nomic-ai/nomic-embed-text-v1.5",
+                        model_kwargs={'trust_remote_code': True},
+                        encode_kwargs=encode_kwargs
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to load nomic-embed-text-v1.5: {e}")
+                    logger.info("Falling back to sentence-transformers/all-MiniLM-L6-v2")
+                    self.embedding_model = HuggingFaceEmbeddings(
+                        model_name="sentence-transformers/all-MiniLM-L6-v2",
+                        encode_kwargs=encode_kwargs
+                    )
 
         return self.embedding_model
 
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a query string (use _embed_query_cached for the cached path)"""
+        return self._init_embeddings().embed_query(query)
+
     def _load_vector_store(self) -> Chroma:
         """Load the existing ChromaDB vector store"""
         if self.vector_store is None:
-            logger.debug("Loading ChromaDB vector store...")
-
+            # Init embeddings before taking the (non-reentrant) lock
             embeddings = self._init_embeddings()
 
-            try:
-                self.vector_store = Chroma(
-                    persist_directory=self.persist_directory,
-                    embedding_function=embeddings,
-                    collection_name=self.collection_name
-                )
-                logger.debug("Successfully loaded vector store")
+            with self._init_lock:
+                if self.vector_store is not None:
+                    return self.vector_store
 
-            except Exception as e:
-                logger.error(f"Failed to load vector store: {e}")
-                raise
+                logger.debug("Loading ChromaDB vector store...")
+
+                try:
+                    self.vector_store = Chroma(
+                        persist_directory=self.persist_directory,
+                        embedding_function=embeddings,
+                        collection_name=self.collection_name,
+                        client=self.client
+                    )
+                    logger.debug("Successfully loaded vector store")
+
+                except Exception as e:
+                    logger.error(f"Failed to load vector store: {e}")
+                    raise
 
         return self.vector_store
 
@@ -158,8 +216,23 @@ class ToolRetriever:
         try:
             vector_store = self._load_vector_store()
 
-            # Use basic similarity search to avoid threshold issues
-            relevant_docs = vector_store.similarity_search(query, k=k)
+            # Embed through the cache, then use basic similarity search
+            # by vector to avoid threshold issues
+            query_embedding = self._embed_query_cached(query)
+
+            # Pre-filter by category when the query names one clearly;
+            # retry unfiltered if the filtered search comes back empty
+            category = _infer_query_category(query)
+            if category is not None:
+                relevant_docs = vector_store.similarity_search_by_vector(
+                    query_embedding, k=k, filter={"category": category}
+                )
+                if not relevant_docs:
+                    relevant_docs = vector_store.similarity_search_by_vector(
+                        query_embedding, k=k
+                    )
+            else:
+                relevant_docs = vector_store.similarity_search_by_vector(query_embedding, k=k)
 
             if not relevant_docs:
                 logger.warning(f"No tools found for query: '{query}'. Using fallback tools.")
@@ -193,6 +266,53 @@ class ToolRetriever:
             logger.info("Falling back to default tools")
             return self.fallback_tools[:k]
 
+    def get_relevant_tools_batch(self, queries: List[str],
+                                 k: Optional[int] = None) -> List[List[Tool]]:
+        """
+        Retrieve relevant tools for several queries in one database call
+
+        Embeds all queries in a single forward pass and issues one Chroma
+        query instead of a roundtrip per query.
+
+        Args:
+            queries: List of user queries or task descriptions
+            k: Number of tools to retrieve per query
+
+        Returns:
+            One list of relevant Tool objects per query, in input order
+        """
+        if k is None:
+            k = self.default_k
+
+        if not queries:
+            return []
+
+        logger.debug(f"Batch-retrieving {k} tools for {len(queries)} queries")
+
+        try:
+            vector_store = self._load_vector_store()
+
+            query_embeddings = self._init_embeddings().embed_documents(queries)
+            response = vector_store._collection.query(
+                query_embeddings=query_embeddings,
+                n_results=k,
+                include=["metadatas"]
+            )
+
+            batched_tools = []
+            for metadatas in response["metadatas"]:
+                tools = [self.tool_registry[meta["name"]]
+                         for meta in metadatas
+                         if meta.get("name") in self.tool_registry]
+                batched_tools.append(tools or self.fallback_tools[:k])
+
+            return batched_tools
+
+        except Exception as e:
+            logger.error(f"Error during batched tool retrieval: {e}")
+            logger.info("Falling back to default tools for all queries")
+            return [self.fallback_tools[:k] for _ in queries]
+
     def get_tools_with_scores(self, query: str, k: Optional[int] = None) -> List[Tuple[Tool, float]]:
         """
         Retrieve tools with their similarity scores
@@ -210,8 +330,15 @@ class ToolRetriever:
         try:
             vector_store = self._load_vector_store()
 
-            # Get documents with scores
-            docs_with_scores = vector_store.similarity_search_with_score(query, k=k)
+            # Get documents with scores, reusing the query-embedding cache
+            # when the store supports scored search by vector
+            if hasattr(vector_store, 'similarity_search_by_vector_with_relevance_scores'):
+                query_embedding = self._embed_query_cached(query)
+                docs_with_scores = vector_store.similarity_search_by_vector_with_relevance_scores(
+                    query_embedding, k=k
+                )
+            else:
+                docs_with_scores = vector_store.similarity_search_with_score(query, k=k)
 
             tools_with_scores = []
             for doc, score in docs_with_scores:
@@ -317,8 +444,9 @@ class MetaMCPToolRetriever(ToolRetriever):
 
     def __init__(self, persist_directory: str = "./chroma_db",
                  collection_name: str = "metamcp_tools",
-                 default_k: int = 5):
-        super().__init__(persist_directory, collection_name, default_k)
+                 default_k: int = 5,
+                 client: Optional[Any] = None):
+        super().__init__(persist_directory, collection_name, default_k, client)
         self.tool_to_server_mapping = {}  # Maps tool names to server UUIDs
 
     def register_metamcp_tools(self, tools_data: List[Dict[str, Any]],
@@ -6,28 +6,100 @@ Extract tools from live MCP servers using direct process communication.
 """
 
 import asyncio
+import functools
 import json
+import shutil
 import subprocess
 import tempfile
 import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - stdlib json is the fallback
+    orjson = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Base environment with proper PATH including nvm node, shared by all
+# server launches; per-server overrides are merged on top
+_BASE_ENV = {
+    "PATH": "/home/cordlesssteve/.nvm/versions/node/v20.19.3/bin:/home/cordlesssteve/.local/bin:/usr/bin:/usr/local/bin",
+    "NODE_PATH": "/home/cordlesssteve/.nvm/versions/node/v20.19.3/lib/node_modules",
+}
+
+def _loads(data):
+    """Parse JSON bytes/str with orjson when available"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _dumps_line(obj: Dict[str, Any]) -> bytes:
+    """Serialize a JSON-RPC request to a newline-terminated bytes payload"""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj).encode() + b"\n"
+
+@functools.lru_cache(maxsize=None)
+def _which(command: str) -> Optional[str]:
+    """Memoized shutil.which - PATH scans are slow and repeat across servers
+
+    Checks the parent PATH first, then the PATH servers are actually
+    launched with (_BASE_ENV), so nvm-only binaries still resolve.
+    """
+    return shutil.which(command) or shutil.which(command, path=_BASE_ENV["PATH"])
+
+@functools.lru_cache(maxsize=None)
+def _detect_server_type(command: str) -> str:
+    """Detect server type from command (pure, so safe to cache)"""
+    if command == "node":
+        return "nodejs"
+    elif command in ["python", "python3", "uv"]:
+        return "python"
+    elif command == "npx":
+        return "npm_package"
+    elif command.endswith(".sh"):
+        return "shell_script"
+    else:
+        return "unknown"
+
+class _ServerSession:
+    """A live MCP server process with its JSON-RPC request-id counter"""
+
+    def __init__(self, server_name: str, command: str,
+                 process: asyncio.subprocess.Process, stderr_task: asyncio.Task):
+        self.server_name = server_name
+        self.command = command
+        self.process = process
+        self.stderr_task = stderr_task
+        self.next_id = 2  # id 1 is taken by initialize
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
 class SimpleMCPExtractor:
-    """Simple MCP tool extractor using subprocess communication"""
+    """Simple MCP tool extractor using subprocess communication
 
-    def __init__(self):
+    Server processes are pooled: the first extraction spawns and
+    initializes them, and later calls (refresh_tools) reuse the live
+    sessions instead of paying the subprocess startup cost again.
+    """
+
+    def __init__(self, max_concurrency: int = 8):
         self.config_path = "/home/cordlesssteve/.config/claude-code/mcp.json"
         self.extracted_tools = []
+        # Bound concurrent server subprocesses so a large config doesn't
+        # exhaust file descriptors or thrash startup I/O
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._sessions: Dict[str, _ServerSession] = {}
 
     def load_mcp_config(self) -> Dict[str, Any]:
         """Load MCP server configuration"""
-        with open(self.config_path, 'r') as f:
-            config = json.load(f)
+        with open(self.config_path, 'rb') as f:
+            config = _loads(f.read())
         return config.get('mcpServers', {})
 
     async def test_single_server(self, server_name: str, server_config: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -59,150 +131,206 @@ class SimpleMCPExtractor:
         elif command == "python" and not self._command_exists("python"):
             command = "python3"  # Use python3 instead of python
 
-        try:
-            # Build environment with proper PATH including nvm node
-            full_env = {
-                "PATH": "/home/cordlesssteve/.nvm/versions/node/v20.19.3/bin:/home/cordlesssteve/.local/bin:/usr/bin:/usr/local/bin",
-                "NODE_PATH": "/home/cordlesssteve/.nvm/versions/node/v20.19.3/lib/node_modules",
-                **env
-            }
+        # Skip unavailable commands up front instead of burning a spawn
+        # attempt, a semaphore slot and the 5s timeout on them
+        if not command.startswith(("/", "./")) and not self._command_exists(command):
+            logger.warning(f"  Command '{command}' not available for {server_name}")
+            return []
 
-            # Start the MCP server process
-            full_command = [command] + args
-            logger.info(f"  Running: {' '.join(full_command)}")
-
-            process = await asyncio.create_subprocess_exec(
-                *full_command,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=full_env,
-                cwd=cwd
-            )
+        async with self._semaphore:
+            return await self._launch_and_extract(server_name, command, args, env, cwd)
 
-            # MCP initialize request
-            initialize_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "clientInfo": {
-                        "name": "mcp-tool-extractor",
-                        "version": "1.0.0"
-                    }
+    async def _launch_and_extract(self, server_name: str, command: str, args: List[str],
+                                  env: Dict[str, str], cwd: Optional[str]) -> List[Dict[str, Any]]:
+        """Get or spawn a server session and list its tools (semaphore-guarded)"""
+        try:
+            session = await self._ensure_session(server_name, command, args, env, cwd)
+            return await self._list_tools(session)
+        except Exception as e:
+            logger.error(f"  ❌ Error with {server_name}: {e}")
+            session = self._sessions.get(server_name)
+            if session is not None:
+                await self._close_session(session)
+            return []
+
+    async def _ensure_session(self, server_name: str, command: str, args: List[str],
+                              env: Dict[str, str], cwd: Optional[str]) -> _ServerSession:
+        """Return a live session for the server, spawning one if needed"""
+        session = self._sessions.get(server_name)
+        if session is not None and session.alive:
+            return session
+
+        # Merge per-server overrides onto the shared base environment
+        full_env = {**_BASE_ENV, **env} if env else _BASE_ENV
+
+        # Start the MCP server process
+        full_command = [command] + args
+        logger.info(f"  Running: {' '.join(full_command)}")
+
+        process = await asyncio.create_subprocess_exec(
+            *full_command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=full_env,
+            cwd=cwd,
+            # A tools/list response is one JSON line; the default 64 KiB
+            # StreamReader limit would make readline() blow up on large
+            # tool corpora
+            limit=8 * 1024 * 1024
+        )
+
+        # MCP initialize request
+        initialize_request = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {
+                    "tools": {}
+                },
+                "clientInfo": {
+                    "name": "mcp-tool-extractor",
+                    "version": "1.0.0"
                 }
             }
+        }
+
+        # Buffered write; flushed together with the first request so the
+        # init/list pipeline still goes out in a single drain
+        process.stdin.write(_dumps_line(initialize_request))
+
+        # Drain stderr in the background so the pipe can't fill up and
+        # block the server while we read stdout
+        stderr_task = asyncio.create_task(process.stderr.read())
+
+        session = _ServerSession(server_name, command, process, stderr_task)
+        self._sessions[server_name] = session
+        return session
+
+    async def _list_tools(self, session: _ServerSession) -> List[Dict[str, Any]]:
+        """Send tools/list on a live session and collect the response"""
+        request_id = session.next_id
+        session.next_id += 1
+
+        session.process.stdin.write(_dumps_line({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/list",
+            "params": {}
+        }))
+        await session.process.stdin.drain()
+
+        # Stream responses line-by-line; stop as soon as the tools/list
+        # response arrives instead of waiting for EOF or the timeout
+        try:
+            tools = await asyncio.wait_for(
+                self._collect_tools(session.process, request_id),
+                timeout=5.0
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"  ⏰ Timeout for {session.server_name}")
+            await self._close_session(session)
+            return []
 
-            # Send initialize
-            init_message = json.dumps(initialize_request) + "\n"
-            process.stdin.write(init_message.encode())
-            await process.stdin.drain()
+        # Add server metadata
+        for tool in tools:
+            tool["server"] = session.server_name
+            tool["server_type"] = self._detect_server_type(session.command)
 
-            # Wait a bit for initialization
-            await asyncio.sleep(0.5)
+        if tools:
+            logger.info(f"  ✅ Found {len(tools)} tools in {session.server_name}")
+        else:
+            logger.warning(f"  ❌ No tools found in {session.server_name}")
 
-            # Send tools/list request
-            list_tools_request = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list",
-                "params": {}
-            }
+        return tools
 
-            list_message = json.dumps(list_tools_request) + "\n"
-            process.stdin.write(list_message.encode())
-            await process.stdin.drain()
+    async def refresh_tools(self) -> List[Dict[str, Any]]:
+        """Re-list tools on all live sessions without respawning servers"""
+        all_tools = []
+        for session in list(self._sessions.values()):
+            if session.alive:
+                all_tools.extend(await self._list_tools(session))
+        return all_tools
 
-            # Close stdin to signal we're done
-            process.stdin.close()
+    async def close(self) -> None:
+        """Shut down all pooled server sessions"""
+        for session in list(self._sessions.values()):
+            await self._close_session(session)
 
-            # Read response with timeout
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=5.0
-                )
-
-                if stderr:
-                    stderr_text = stderr.decode()
-                    if "error" not in stderr_text.lower():
-                        logger.debug(f"  {server_name} stderr: {stderr_text[:200]}...")
-
-                # Parse stdout for JSON responses
-                stdout_text = stdout.decode()
-                tools = self._parse_mcp_responses(stdout_text, server_name)
-
-                # Add server metadata
-                for tool in tools:
-                    tool["server"] = server_name
-                    tool["server_type"] = self._detect_server_type(command)
-
-                if tools:
-                    logger.info(f"  ✅ Found {len(tools)} tools in {server_name}")
-                    return tools
-                else:
-                    logger.warning(f"  ❌ No tools found in {server_name}")
-                    return []
-
-            except asyncio.TimeoutError:
-                logger.error(f"  ⏰ Timeout for {server_name}")
-                process.kill()
-                return []
+    async def _close_session(self, session: _ServerSession) -> None:
+        """Terminate one session and log any interesting stderr output"""
+        self._sessions.pop(session.server_name, None)
+        await self._shutdown(session.process)
 
-        except Exception as e:
-            logger.error(f"  ❌ Error with {server_name}: {e}")
-            return []
+        stderr_output = b""
+        try:
+            stderr_output = await asyncio.wait_for(session.stderr_task, timeout=0.5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
 
-    def _parse_mcp_responses(self, stdout_text: str, server_name: str) -> List[Dict[str, Any]]:
-        """Parse MCP JSON-RPC responses from stdout"""
-        tools = []
+        if stderr_output:
+            stderr_text = stderr_output.decode(errors="replace")
+            if "error" not in stderr_text.lower():
+                logger.debug(f"  {session.server_name} stderr: {stderr_text[:200]}...")
 
-        # Split by lines and look for JSON responses
-        lines = stdout_text.strip().split('\n')
+    async def _shutdown(self, process: asyncio.subprocess.Process) -> None:
+        """Terminate a server process, escalating to kill if it lingers"""
+        if process.returncode is not None:
+            return
 
-        for line in lines:
-            line = line.strip()
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=1.0)
+        except asyncio.TimeoutError:
+            process.kill()
+
+    async def _read_responses(self, stdout: asyncio.StreamReader):
+        """Yield parsed JSON-RPC responses from a server's stdout stream"""
+        while True:
+            line = await stdout.readline()
             if not line:
+                break
+
+            line = line.strip()
+            if not line or line[:1] not in (b'{', b'['):
+                # Skip blank and non-JSON lines (e.g. server logs on
+                # stdout) without paying for a JSONDecodeError
                 continue
 
             try:
-                response = json.loads(line)
+                yield _loads(line)
+            except ValueError:
+                continue
+
+    async def _collect_tools(self, process: asyncio.subprocess.Process,
+                             request_id: int) -> List[Dict[str, Any]]:
+        """Collect tools from streamed responses until tools/list answers"""
+        tools = []
 
-                # Check if this is a tools/list response
-                if (isinstance(response, dict) and
-                    "result" in response and
-                    isinstance(response["result"], dict) and
-                    "tools" in response["result"]):
+        async for response in self._read_responses(process.stdout):
+            # Check if this is a tools/list response
+            if (isinstance(response, dict) and
+                "result" in response and
+                isinstance(response["result"], dict) and
+                "tools" in response["result"]):
 
-                    tools.extend(response["result"]["tools"])
+                tools.extend(response["result"]["tools"])
 
-            except json.JSONDecodeError:
-                # Skip non-JSON lines
-                continue
+                if response.get("id") == request_id:
+                    # tools/list has answered - no need to read further
+                    break
 
         return tools
 
     def _command_exists(self, command: str) -> bool:
-        """Check if a command exists in the system"""
-        import shutil
-        return shutil.which(command) is not None
+        """Check if a command exists in the system (memoized across servers)"""
+        return _which(command) is not None
 
     def _detect_server_type(self, command: str) -> str:
         """Detect server type from command"""
-        if command == "node":
-            return "nodejs"
-        elif command in ["python", "python3", "uv"]:
-            return "python"
-        elif command == "npx":
-            return "npm_package"
-        elif command.endswith(".sh"):
-            return "shell_script"
-        else:
-            return "unknown"
+        return _detect_server_type(command)
 
     async def extract_all_tools(self) -> List[Dict[str, Any]]:
         """Extract tools from all servers"""
@@ -215,16 +343,24 @@ class SimpleMCPExtractor:
         successful_servers = []
         failed_servers = []
 
-        for server_name, server_config in config.items():
+        async def run_one(server_name: str, server_config: Dict[str, Any]):
             try:
-                tools = await self.test_single_server(server_name, server_config)
-                if tools:
-                    all_tools.extend(tools)
-                    successful_servers.append(server_name)
-                else:
-                    failed_servers.append(server_name)
+                return server_name, await self.test_single_server(server_name, server_config)
             except Exception as e:
                 logger.error(f"Failed to process {server_name}: {e}")
+                return server_name, None
+
+        # Test servers concurrently; the semaphore in test_single_server
+        # keeps the number of live subprocesses bounded
+        results = await asyncio.gather(
+            *(run_one(name, cfg) for name, cfg in config.items())
+        )
+
+        for server_name, tools in results:
+            if tools:
+                all_tools.extend(tools)
+                successful_servers.append(server_name)
+            else:
                 failed_servers.append(server_name)
 
         logger.info(f"\n📊 EXTRACTION RESULTS:")
@@ -241,8 +377,11 @@ class SimpleMCPExtractor:
 
     def save_tools(self, tools: List[Dict[str, Any]], filename: str = "real_mcp_tools.json"):
         """Save extracted tools"""
-        with open(filename, 'w') as f:
-            json.dump(tools, f, indent=2)
+        with open(filename, 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(tools, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(tools, indent=2).encode())
 
         logger.info(f"💾 Saved {len(tools)} tools to {filename}")
 
@@ -264,15 +403,18 @@ async def main():
     print("="*50)
 
     extractor = SimpleMCPExtractor()
-    tools = await extractor.extract_all_tools()
+    try:
+        tools = await extractor.extract_all_tools()
 
-    if tools:
-        extractor.save_tools(tools)
-        print(f"\n🎉 Success! Extracted {len(tools)} real tools")
-    else:
-        print(f"\n❌ No tools extracted")
+        if tools:
+            extractor.save_tools(tools)
+            print(f"\n🎉 Success! Extracted {len(tools)} real tools")
+        else:
+            print(f"\n❌ No tools extracted")
 
-    return tools
+        return tools
+    finally:
+        await extractor.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -6,59 +6,157 @@ Test the RAG system using real tool definitions with a simpler setup.
 """
 
 import json
+import mmap
 import time
 from typing import List, Dict, Any, Tuple
 
-def calculate_simple_similarity(query: str, text: str) -> float:
-    """Simple word-based similarity scoring"""
-    query_words = set(query.lower().split())
-    text_words = set(text.lower().split())
-
-    if not query_words or not text_words:
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional here - the pure-Python scoring path still works
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - stdlib json is the fallback
+    orjson = None
+
+def load_tools(path: str = "real_mcp_tools.json") -> List[Dict[str, Any]]:
+    """Load the extracted tool list, memory-mapping the file when possible"""
+    with open(path, 'rb') as f:
+        if orjson is not None:
+            try:
+                # mmap avoids an intermediate bytes copy of the whole file
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped; fall back to a plain read
+                return orjson.loads(f.read())
+            with mm:
+                # orjson wants a memoryview, not the mmap object itself
+                return orjson.loads(memoryview(mm))
+
+        return json.load(f)
+
+def calculate_simple_similarity(query_words: frozenset, tool_words: frozenset) -> float:
+    """Word-set similarity: Jaccard plus a boost for matched query words"""
+    if not query_words or not tool_words:
         return 0.0
 
-    intersection = len(query_words.intersection(text_words))
-    union = len(query_words.union(text_words))
-
-    # Jaccard similarity with a boost for exact matches
-    jaccard = intersection / union if union > 0 else 0.0
-
-    # Boost score for tools that contain query words
-    exact_matches = sum(1 for word in query_words if word in text.lower())
-    boost = exact_matches / len(query_words) if query_words else 0.0
-
-    return jaccard + (boost * 0.5)
+    # One intersection feeds both terms; union comes from set sizes, so
+    # the whole score is a single pass of C-level set ops
+    intersection = len(query_words & tool_words)
+    union = len(query_words) + len(tool_words) - intersection
+
+    return (intersection / union) + (intersection / len(query_words)) * 0.5
+
+def build_searchable_text(tool: Dict[str, Any]) -> str:
+    """Build searchable text from tool name, description and parameters"""
+    searchable_text = f"{tool['name']} {tool['description']}"
+
+    # Add input schema information if available
+    if 'inputSchema' in tool and 'properties' in tool['inputSchema']:
+        properties = tool['inputSchema']['properties']
+        for prop_name, prop_info in properties.items():
+            if isinstance(prop_info, dict) and 'description' in prop_info:
+                searchable_text += f" {prop_name} {prop_info['description']}"
+
+    return searchable_text
+
+class PreparedCorpus:
+    """Precomputed search corpus: per-tool word sets plus an optional
+    term-tool occurrence matrix for vectorized scoring"""
+
+    def __init__(self, tools_data: List[Dict[str, Any]]):
+        self.tools = list(tools_data)
+        self.word_sets = []
+        self.servers: Dict[str, List[str]] = {}
+
+        # Single pass: build the search corpus and the per-server tool
+        # grouping together instead of re-iterating tools_data
+        for tool in self.tools:
+            self.word_sets.append(
+                frozenset(build_searchable_text(tool).lower().split())
+            )
+            self.servers.setdefault(tool.get('server', 'unknown'), []).append(tool['name'])
+
+        self.vocab = {}
+        self.matrix = None
+        self.word_counts = None
+
+        if np is not None:
+            for words in self.word_sets:
+                for word in words:
+                    self.vocab.setdefault(word, len(self.vocab))
+
+            matrix = np.zeros((len(self.tools), len(self.vocab)), dtype=bool)
+            for row, words in enumerate(self.word_sets):
+                for word in words:
+                    matrix[row, self.vocab[word]] = True
+
+            self.matrix = matrix
+            self.word_counts = matrix.sum(axis=1)
+
+    def __len__(self):
+        return len(self.tools)
+
+def prepare_tools(tools_data: List[Dict[str, Any]]) -> PreparedCorpus:
+    """Precompute lowercased word sets per tool so every query reuses them"""
+    return PreparedCorpus(tools_data)
+
+def _retrieve_vectorized(query_words: frozenset, corpus: PreparedCorpus,
+                         k: int) -> List[Tuple[Dict, float]]:
+    """Score all tools at once against the term-tool matrix"""
+    q_idx = np.fromiter(
+        (corpus.vocab[word] for word in query_words if word in corpus.vocab),
+        dtype=np.intp
+    )
+
+    if q_idx.size:
+        intersections = corpus.matrix[:, q_idx].sum(axis=1)
+    else:
+        intersections = np.zeros(len(corpus.tools))
+
+    # union = |tool words| + |query words| - intersection
+    unions = corpus.word_counts + len(query_words) - intersections
+    jaccard = intersections / np.maximum(unions, 1)
+    boost = intersections / len(query_words)
+    scores = jaccard + (boost * 0.5)
+
+    # Partial selection (O(T + k log k)) instead of a full sort
+    if k < len(scores):
+        top_idx = np.argpartition(-scores, k)[:k]
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+    else:
+        top_idx = np.argsort(-scores)
 
-def simple_retrieve_tools(query: str, tools_data: List[Dict[str, Any]], k: int = 5) -> List[Tuple[Dict, float]]:
-    """Simple retrieval without vector embeddings"""
-    scored_tools = []
+    return [(corpus.tools[i], float(scores[i])) for i in top_idx]
 
-    for tool in tools_data:
-        # Create searchable text from tool name and description
-        searchable_text = f"{tool['name']} {tool['description']}"
+def simple_retrieve_tools(query: str, prepared_tools: PreparedCorpus,
+                          k: int = 5) -> List[Tuple[Dict, float]]:
+    """Simple retrieval without vector embeddings over a prepared corpus"""
+    query_words = frozenset(query.lower().split())
 
-        # Add input schema information if available
-        if 'inputSchema' in tool and 'properties' in tool['inputSchema']:
-            properties = tool['inputSchema']['properties']
-            for prop_name, prop_info in properties.items():
-                if isinstance(prop_info, dict) and 'description' in prop_info:
-                    searchable_text += f" {prop_name} {prop_info['description']}"
+    if prepared_tools.matrix is not None and query_words:
+        return _retrieve_vectorized(query_words, prepared_tools, k)
 
-        # Calculate similarity
-        score = calculate_simple_similarity(query, searchable_text)
-        scored_tools.append((tool, score))
+    # Pure-Python fallback when NumPy is unavailable
+    scored_tools = [
+        (tool, calculate_simple_similarity(query_words, tool_words))
+        for tool, tool_words in zip(prepared_tools.tools, prepared_tools.word_sets)
+    ]
 
     # Sort by score and return top k
     scored_tools.sort(key=lambda x: x[1], reverse=True)
     return scored_tools[:k]
 
-def test_query(query: str, tools_data: List[Dict[str, Any]], expected_count: int = 5):
+def test_query(query: str, prepared_tools: PreparedCorpus, expected_count: int = 5):
     """Test a single query and show results"""
     print(f"\n🔍 Query: '{query}'")
     print("=" * 80)
 
     start_time = time.time()
-    results = simple_retrieve_tools(query, tools_data, k=expected_count)
+    results = simple_retrieve_tools(query, prepared_tools, k=expected_count)
     retrieval_time = time.time() - start_time
 
     if results:
@@ -72,8 +170,8 @@ def test_query(query: str, tools_data: List[Dict[str, Any]], expected_count: int
 
         # Show performance metrics
         print(f"⚡ Retrieval time: {retrieval_time:.3f}s")
-        print(f"💰 Token efficiency: Using {len(results)} tools instead of {len(tools_data)} total tools")
-        savings_pct = ((len(tools_data) - len(results)) / len(tools_data)) * 100
+        print(f"💰 Token efficiency: Using {len(results)} tools instead of {len(prepared_tools)} total tools")
+        savings_pct = ((len(prepared_tools) - len(results)) / len(prepared_tools)) * 100
         print(f"   📊 {savings_pct:.1f}% token savings!")
     else:
         print("❌ No tools found")
@@ -88,21 +186,15 @@ def main():
     # Load real tools extracted from live servers
     print("🔧 Loading real tools from live servers...")
 
-    with open("real_mcp_tools.json", 'r') as f:
-        tools_data = json.load(f)
+    tools_data = load_tools("real_mcp_tools.json")
 
-    print(f"✅ Loaded {len(tools_data)} real tools from {len(set(t['server'] for t in tools_data))} live servers")
+    # One pass builds the search corpus and the server grouping together
+    prepared_tools = prepare_tools(tools_data)
 
-    # Show available servers and their tools
-    servers = {}
-    for tool in tools_data:
-        server = tool.get('server', 'unknown')
-        if server not in servers:
-            servers[server] = []
-        servers[server].append(tool['name'])
+    print(f"✅ Loaded {len(prepared_tools)} real tools from {len(prepared_tools.servers)} live servers")
 
     print(f"\n📋 Available servers and tools:")
-    for server, tool_names in servers.items():
+    for server, tool_names in prepared_tools.servers.items():
         print(f"  {server}: {len(tool_names)} tools")
         for name in tool_names[:3]:
             print(f"    - {name}")
@@ -128,14 +220,14 @@ def main():
     all_retrieved_tools = set()
     for i, scenario in enumerate(test_scenarios, 1):
         print(f"\n📝 Test {i}/{len(test_scenarios)}")
-        retrieved = test_query(scenario, tools_data)
+        retrieved = test_query(scenario, prepared_tools)
         all_retrieved_tools.update(retrieved)
 
     print("\n" + "="*80)
     print("🎉 SIMPLE RAG TEST COMPLETED!")
     print("="*80)
     print("✅ Key Results:")
-    print(f"  🎯 {len(tools_data)} real tools from {len(set(t['server'] for t in tools_data))} live servers")
+    print(f"  🎯 {len(prepared_tools)} real tools from {len(prepared_tools.servers)} live servers")
     print(f"  🛠️  {len(all_retrieved_tools)} unique tools retrieved across all queries")
     print("  💰 90%+ context window optimization per query")
     print("  ⚡ Sub-second retrieval performance")
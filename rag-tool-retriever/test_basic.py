@@ -4,6 +4,7 @@ Basic test to verify core functionality without external dependencies
 """
 
 import json
+import re
 import sys
 import os
 from pathlib import Path
@@ -21,10 +22,9 @@ def test_file_structure():
         "README.md"
     ]
 
-    missing_files = []
-    for file in required_files:
-        if not os.path.exists(file):
-            missing_files.append(file)
+    # One scandir snapshot instead of a stat call per file
+    present = {entry.name for entry in os.scandir('.')}
+    missing_files = [file for file in required_files if file not in present]
 
     if missing_files:
         print(f"✗ Missing files: {missing_files}")
@@ -201,7 +201,11 @@ def test_directory_structure():
     try:
         for dirname in test_dirs:
             Path(dirname).mkdir(exist_ok=True)
-            if not os.path.exists(dirname):
+
+        # Verify all directories with a single scandir snapshot
+        present = {entry.name for entry in os.scandir('.') if entry.is_dir()}
+        for dirname in test_dirs:
+            if dirname not in present:
                 print(f"✗ Failed to create directory: {dirname}")
                 return False
 
@@ -209,7 +213,7 @@ def test_directory_structure():
 
         # Cleanup
         for dirname in test_dirs:
-            if os.path.exists(dirname):
+            if dirname in present:
                 os.rmdir(dirname)
 
     except Exception as e:
@@ -236,15 +240,25 @@ def test_metaMCP_integration_structure():
             "discover_and_index_tools"
         ]
 
-        missing_items = []
-
-        for class_name in required_classes:
-            if f"class {class_name}" not in content:
-                missing_items.append(f"class {class_name}")
+        # One compiled multi-pattern scan over the file instead of a full
+        # substring search per required name
+        pattern = re.compile(
+            r"class (" + "|".join(map(re.escape, required_classes)) + r")\b"
+            r"|def (" + "|".join(map(re.escape, required_methods)) + r")\b"
+        )
+
+        found_classes = set()
+        found_methods = set()
+        for match in pattern.finditer(content):
+            if match.group(1):
+                found_classes.add(match.group(1))
+            else:
+                found_methods.add(match.group(2))
 
-        for method_name in required_methods:
-            if f"def {method_name}" not in content:
-                missing_items.append(f"method {method_name}")
+        missing_items = [f"class {name}" for name in required_classes
+                         if name not in found_classes]
+        missing_items += [f"method {name}" for name in required_methods
+                          if name not in found_methods]
 
         if missing_items:
             print(f"✗ Integration example missing: {missing_items}")
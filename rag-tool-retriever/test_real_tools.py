@@ -5,44 +5,59 @@ Test RAG System with Real Tool Definitions
 Test the RAG system using real tool definitions extracted from live MCP servers.
 """
 
+import asyncio
+import hashlib
 import json
-from tool_definitions import ToolStandardizer
+import os
 from ingest import ToolIngestionPipeline
 from retriever import ToolRetriever
 
-def test_query(retriever, query, tools_data, expected_count=5):
-    """Test a single query and show results"""
-    print(f"\n🔍 Query: '{query}'")
-    print("=" * 80)
+try:
+    import ijson
+except ImportError:
+    # ijson is optional - without it the file is parsed in one json.load
+    ijson = None
+
+def iter_tools(path):
+    """Yield tool dicts one at a time, streaming with ijson when available"""
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item')
+    else:
+        with open(path, 'r') as f:
+            yield from json.load(f)
+
+def test_query(retriever, query, name_to_server, total_tools, expected_count=5):
+    """Test a single query; returns (retrieved names, printable report)
+
+    Output is buffered rather than printed so queries can run
+    concurrently without interleaving their reports.
+    """
+    lines = [f"\n🔍 Query: '{query}'", "=" * 80]
 
     # Get tools with scores for detailed analysis
     tools_with_scores = retriever.get_tools_with_scores(query, k=expected_count)
 
     if tools_with_scores:
-        print("📋 Retrieved tools:")
+        lines.append("📋 Retrieved tools:")
         for i, (tool, score) in enumerate(tools_with_scores, 1):
-            # Find the server for this tool
-            server = "unknown"
-            for t in tools_data:
-                if t["name"] == tool.name:
-                    server = t["server"]
-                    break
-
-            print(f"  {i}. 🛠️  {tool.name} (server: {server})")
-            print(f"      📝 {tool.description[:100]}...")
-            print(f"      📊 Score: {score:.2f}")
-            print()
+            server = name_to_server.get(tool.name, "unknown")
+
+            lines.append(f"  {i}. 🛠️  {tool.name} (server: {server})")
+            lines.append(f"      📝 {tool.description[:100]}...")
+            lines.append(f"      📊 Score: {score:.2f}")
+            lines.append("")
 
         # Show token savings
-        print(f"💰 Token efficiency: Using {len(tools_with_scores)} tools instead of {len(tools_data)} total tools")
-        savings_pct = ((len(tools_data) - len(tools_with_scores)) / len(tools_data)) * 100
-        print(f"   📊 {savings_pct:.1f}% token savings!")
+        lines.append(f"💰 Token efficiency: Using {len(tools_with_scores)} tools instead of {total_tools} total tools")
+        savings_pct = ((total_tools - len(tools_with_scores)) / total_tools) * 100
+        lines.append(f"   📊 {savings_pct:.1f}% token savings!")
     else:
-        print("❌ No tools found")
+        lines.append("❌ No tools found")
 
-    return [tool.name for tool, _ in tools_with_scores]
+    return [tool.name for tool, _ in tools_with_scores], "\n".join(lines)
 
-def main():
+async def main():
     """Run tests with real tools"""
     print("🚀 RAG Tool Retriever Test - Real Tools from Live Servers")
     print("=" * 80)
@@ -50,24 +65,56 @@ def main():
     # Load real tools extracted from live servers
     print("🔧 Setting up RAG system with real tools...")
 
-    with open("real_mcp_tools.json", 'r') as f:
-        tools_data = json.load(f)
+    # Stream tools into the standardizer, collecting the name->server
+    # map for reporting on the way through instead of holding the whole
+    # parsed file just for that lookup
+    name_to_server = {}
+
+    def tools_stream():
+        for tool in iter_tools("real_mcp_tools.json"):
+            name_to_server[tool["name"]] = tool["server"]
+            yield tool
+
+    # Rebuild the vector store only when the tool file changed; a warm
+    # run reopens the persisted index and skips the whole embedding pass
+    tools_file = "real_mcp_tools.json"
+    persist_dir = "./real_tools_db"
+    hash_file = os.path.join(persist_dir, ".hash")
 
-    # Create vector store
-    pipeline = ToolIngestionPipeline("./real_tools_db")
-    pipeline.standardizer.load_from_metamcp_format(tools_data)
-    pipeline.create_vector_store()
+    with open(tools_file, 'rb') as f:
+        content_hash = hashlib.sha256(f.read()).hexdigest()
+
+    try:
+        with open(hash_file) as f:
+            index_fresh = f.read().strip() == content_hash
+    except OSError:
+        index_fresh = False
+
+    pipeline = ToolIngestionPipeline(persist_dir)
+    pipeline.standardizer.load_from_metamcp_format(tools_stream())
+
+    if index_fresh:
+        print("✓ Vector store matches current tool file, skipping rebuild")
+    else:
+        pipeline.create_vector_store()
+        with open(hash_file, 'w') as f:
+            f.write(content_hash)
 
     # Create retriever
-    retriever = ToolRetriever("./real_tools_db", default_k=5)
+    retriever = ToolRetriever(persist_dir, default_k=5)
 
-    # Register tools
-    standardizer = ToolStandardizer()
-    standardizer.load_from_metamcp_format(tools_data)
-    langchain_tools = standardizer.get_langchain_tools()
+    # Register tools from the pipeline's standardizer - it already
+    # standardized this exact input, so a second pass would be wasted
+    langchain_tools = pipeline.standardizer.get_langchain_tools()
     retriever.register_tools(langchain_tools)
 
-    print(f"✅ Loaded {len(tools_data)} real tools from {len(set(t['server'] for t in tools_data))} live servers")
+    # Warm the embedding model and vector store up front so the
+    # concurrent queries below don't all hit a cold retriever at once
+    retriever._load_vector_store()
+
+    total_tools = len(name_to_server)
+
+    print(f"✅ Loaded {total_tools} real tools from {len(set(name_to_server.values()))} live servers")
 
     # Test real-world scenarios with actual tool capabilities
     test_scenarios = [
@@ -84,15 +131,23 @@ def main():
     print("🎯 TESTING WITH REAL TOOLS")
     print("="*80)
 
-    for i, scenario in enumerate(test_scenarios, 1):
+    # All scenarios run concurrently in worker threads (test_query only
+    # reads shared state); the buffered reports print in scenario order
+    results = await asyncio.gather(
+        *(asyncio.to_thread(test_query, retriever, scenario,
+                            name_to_server, total_tools)
+          for scenario in test_scenarios)
+    )
+
+    for i, (retrieved, report) in enumerate(results, 1):
         print(f"\n📝 Test {i}/{len(test_scenarios)}")
-        retrieved = test_query(retriever, scenario, tools_data)
+        print(report)
 
     print("\n" + "="*80)
     print("🎉 REAL TOOLS RAG TEST COMPLETED!")
     print("="*80)
     print("✅ Key Results:")
-    print(f"  🎯 {len(tools_data)} real tools from {len(set(t['server'] for t in tools_data))} live servers")
+    print(f"  🎯 {total_tools} real tools from {len(set(name_to_server.values()))} live servers")
     print("  💰 90%+ context window optimization")
     print("  ⚡ Sub-second retrieval performance")
     print("  🔗 Real tool schemas and descriptions")
@@ -100,4 +155,4 @@ def main():
     print("\n🚀 RAG system validated with live MCP data!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
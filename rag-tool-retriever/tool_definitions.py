@@ -6,12 +6,70 @@ with rich, semantic descriptions for optimal vector embedding and retrieval.
 """
 
 from langchain.tools import Tool
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Optional
+import concurrent.futures
+import functools
 import json
 import logging
+import re
+import sys
 
 logger = logging.getLogger(__name__)
 
+# Keyword-extraction vocabulary, hoisted so it is built once instead of
+# per add_mcp_tool call.
+_ACTION_WORDS = [
+    'create', 'read', 'write', 'update', 'delete', 'get', 'set', 'list',
+    'search', 'find', 'execute', 'run', 'send', 'receive', 'fetch',
+    'upload', 'download', 'generate', 'analyze', 'process', 'transform'
+]
+
+_DOMAIN_KEYWORDS = {
+    'file': ['filesystem', 'directory', 'folder', 'document'],
+    'git': ['version control', 'repository', 'commit', 'branch'],
+    'database': ['data', 'query', 'record', 'table'],
+    'api': ['web', 'http', 'request', 'endpoint'],
+    'browser': ['web', 'automation', 'selenium', 'playwright'],
+    'email': ['message', 'communication', 'send'],
+    'auth': ['authentication', 'login', 'security', 'token']
+}
+
+# One combined scan over the whole vocabulary (a compiled alternation is
+# the multi-pattern matcher for a fixed set this small): action words
+# match on word boundaries, domain triggers as plain substrings, and
+# each hit is classified by looking it up in _DOMAIN_KEYWORDS
+_KEYWORD_SCAN_RE = re.compile(
+    r'\b(?:' + '|'.join(_ACTION_WORDS) + r')\b|'
+    + '|'.join(_DOMAIN_KEYWORDS)
+)
+
+# Use-case inference rules: token sets intersected against the
+# tokenized tool name, in the order their phrases appear in the output
+_USE_CASE_RULES = [
+    (frozenset({'file', 'read', 'write', 'directory'}),
+     "working with files or directories"),
+    (frozenset({'git', 'commit', 'branch', 'repo'}),
+     "managing version control or repositories"),
+    (frozenset({'web', 'http', 'api', 'request'}),
+     "making web requests or API calls"),
+    (frozenset({'browser', 'click', 'navigate'}),
+     "automating browser interactions"),
+    (frozenset({'search', 'query', 'find', 'filter'}),
+     "searching or querying data"),
+    (frozenset({'send', 'email', 'message', 'notify'}),
+     "sending messages or notifications"),
+]
+
+_NAME_TOKEN_RE = re.compile(r'[_\-\s]+')
+
+# Corpora at least this large standardize across worker processes;
+# below it the fork/pickle overhead outweighs the parallel speedup
+_PARALLEL_STANDARDIZE_THRESHOLD = 2000
+
+def _placeholder_executor(name: str, *args, **kwargs):
+    """Placeholder executor - replaced by actual MCP call in integration"""
+    return f"Tool {name} executed with args: {args}, kwargs: {kwargs}"
+
 class StandardizedTool:
     """Wrapper for standardized tool with enhanced metadata"""
 
@@ -22,6 +80,9 @@ class StandardizedTool:
         self.description = description
         self.original_schema = original_schema or {}
         self.server_source = server_source
+        # Serialized once up front: metadata export re-reads this string,
+        # and compact separators shrink what lands in Chroma's SQLite
+        self._schema_json = json.dumps(self.original_schema, separators=(',', ':'))
 
     def to_langchain_tool(self) -> Tool:
         """Convert to LangChain Tool object"""
@@ -36,6 +97,22 @@ class ToolStandardizer:
 
     def __init__(self):
         self.tools: List[StandardizedTool] = []
+        # Column lists kept in sync with self.tools so the hot export
+        # paths hand back flat lists instead of attribute-chasing
+        # through every tool object on each call
+        self._descriptions: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+
+    def add_standardized_tool(self, tool: StandardizedTool) -> StandardizedTool:
+        """Append an already-standardized tool, keeping columns in sync"""
+        self.tools.append(tool)
+        self._descriptions.append(tool.description)
+        self._metadata.append({
+            "name": tool.name,
+            "server_source": tool.server_source,
+            "original_schema": tool._schema_json
+        })
+        return tool
 
     def add_mcp_tool(self, tool_data: Dict[str, Any], server_name: str = "unknown") -> StandardizedTool:
         """
@@ -48,32 +125,24 @@ class ToolStandardizer:
         Returns:
             StandardizedTool object
         """
-        name = tool_data.get('name', 'unnamed_tool')
-        base_description = tool_data.get('description', 'No description provided')
-        input_schema = tool_data.get('inputSchema', {})
+        return self.add_standardized_tool(build_standardized(tool_data, server_name))
 
-        # Enhance description for better semantic retrieval
-        enhanced_description = self._enhance_description(
-            name, base_description, input_schema, server_name
-        )
+    def add_mcp_tools_bulk(self, tools_data: List[Dict[str, Any]],
+                           server_name: str = "unknown") -> List[StandardizedTool]:
+        """
+        Convert a batch of MCP tool definitions from one server in a single call
 
-        # Create a callable function wrapper
-        def tool_executor(*args, **kwargs):
-            """Placeholder executor - will be replaced by actual MCP call in integration"""
-            return f"Tool {name} executed with args: {args}, kwargs: {kwargs}"
-
-        standardized_tool = StandardizedTool(
-            name=name,
-            func=tool_executor,
-            description=enhanced_description,
-            original_schema=tool_data,
-            server_source=server_name
-        )
+        Args:
+            tools_data: List of MCP tool definition dicts
+            server_name: Name of the source MCP server shared by the batch
 
-        self.tools.append(standardized_tool)
-        return standardized_tool
+        Returns:
+            List of StandardizedTool objects in input order
+        """
+        return [self.add_mcp_tool(tool_data, server_name) for tool_data in tools_data]
 
-    def _enhance_description(self, name: str, description: str,
+    @staticmethod
+    def _enhance_description(name: str, description: str,
                            input_schema: Dict[str, Any], server_name: str) -> str:
         """
         Create a rich, semantic description for vector embedding
@@ -106,84 +175,46 @@ class ToolStandardizer:
                 enhanced_parts.extend(param_descriptions)
 
         # Add use case keywords based on tool name and description
-        keywords = self._extract_keywords(name, description)
+        keywords = ToolStandardizer._extract_keywords(name, description)
         if keywords:
             enhanced_parts.append(f"Keywords: {', '.join(keywords)}")
 
         # Add context about when to use this tool
-        use_cases = self._infer_use_cases(name, description)
+        use_cases = ToolStandardizer._infer_use_cases(name, description)
         if use_cases:
             enhanced_parts.append(f"Use when: {use_cases}")
 
         return "\n".join(enhanced_parts)
 
-    def _extract_keywords(self, name: str, description: str) -> List[str]:
+    @staticmethod
+    def _extract_keywords(name: str, description: str) -> List[str]:
         """Extract relevant keywords for semantic search"""
         keywords = set()
 
         # Extract from tool name
-        name_parts = name.lower().replace('_', ' ').replace('-', ' ').split()
-        keywords.update(name_parts)
-
-        # Extract key action words from description
-        action_words = [
-            'create', 'read', 'write', 'update', 'delete', 'get', 'set', 'list',
-            'search', 'find', 'execute', 'run', 'send', 'receive', 'fetch',
-            'upload', 'download', 'generate', 'analyze', 'process', 'transform'
-        ]
-
-        description_lower = description.lower()
-        for word in action_words:
-            if word in description_lower:
-                keywords.add(word)
-
-        # Extract domain-specific keywords
-        domain_keywords = {
-            'file': ['filesystem', 'directory', 'folder', 'document'],
-            'git': ['version control', 'repository', 'commit', 'branch'],
-            'database': ['data', 'query', 'record', 'table'],
-            'api': ['web', 'http', 'request', 'endpoint'],
-            'browser': ['web', 'automation', 'selenium', 'playwright'],
-            'email': ['message', 'communication', 'send'],
-            'auth': ['authentication', 'login', 'security', 'token']
-        }
+        name_lower = name.lower()
+        keywords.update(name_lower.replace('_', ' ').replace('-', ' ').split())
 
-        for domain, related_words in domain_keywords.items():
-            if domain in description_lower or domain in name.lower():
+        # A single pass over name and description finds action words and
+        # domain triggers together
+        for hit in _KEYWORD_SCAN_RE.findall(f"{name_lower} {description.lower()}"):
+            related_words = _DOMAIN_KEYWORDS.get(hit)
+            if related_words is not None:
                 keywords.update(related_words)
+            else:
+                keywords.add(hit)
 
         return list(keywords)
 
-    def _infer_use_cases(self, name: str, description: str) -> str:
+    @staticmethod
+    def _infer_use_cases(name: str, description: str) -> str:
         """Infer when this tool should be used based on patterns"""
-        name_lower = name.lower()
-        desc_lower = description.lower()
-
-        use_cases = []
-
-        # File operations
-        if any(word in name_lower for word in ['file', 'read', 'write', 'directory']):
-            use_cases.append("working with files or directories")
-
-        # Git operations
-        if any(word in name_lower for word in ['git', 'commit', 'branch', 'repo']):
-            use_cases.append("managing version control or repositories")
-
-        # Web/API operations
-        if any(word in name_lower for word in ['web', 'http', 'api', 'request']):
-            use_cases.append("making web requests or API calls")
-
-        # Browser automation
-        if any(word in name_lower for word in ['browser', 'click', 'navigate']):
-            use_cases.append("automating browser interactions")
-
-        # Data operations
-        if any(word in name_lower for word in ['search', 'query', 'find', 'filter']):
-            use_cases.append("searching or querying data")
+        # Tokenize the name once; each rule is then a set intersection
+        # instead of a fresh list and a substring scan per keyword
+        name_tokens = frozenset(_NAME_TOKEN_RE.split(name.lower()))
 
-        # Communication
-        if any(word in name_lower for word in ['send', 'email', 'message', 'notify']):
-            use_cases.append("sending messages or notifications")
+        use_cases = [phrase for tokens, phrase in _USE_CASE_RULES
+                     if name_tokens & tokens]
 
         return "; ".join(use_cases) if use_cases else "general purpose tasks"
 
@@ -193,41 +224,92 @@ class ToolStandardizer:
 
     def get_tool_descriptions(self) -> List[str]:
         """Get all enhanced descriptions for embedding"""
-        return [tool.description for tool in self.tools]
+        return self._descriptions
 
     def get_tool_metadata(self) -> List[Dict[str, Any]]:
         """Get metadata for each tool (for ChromaDB storage)"""
-        return [
-            {
-                "name": tool.name,
-                "server_source": tool.server_source,
-                "original_schema": json.dumps(tool.original_schema)
-            }
-            for tool in self.tools
-        ]
+        return self._metadata
 
     def load_from_metamcp_format(self, metamcp_tools: List[Dict[str, Any]]) -> None:
         """
         Load tools from metaMCP format (as seen in the proxy code)
 
         Args:
-            metamcp_tools: List of tool definitions from metaMCP
+            metamcp_tools: List (or iterable) of tool definitions from metaMCP
         """
-        for tool_data in metamcp_tools:
-            # Extract server name from the prefixed tool name
-            tool_name = tool_data.get('name', '')
-            if '__' in tool_name:
-                server_name = tool_name.split('__')[0].replace('_', ' ').title()
-                actual_tool_name = tool_name.split('__', 1)[1]
-            else:
-                server_name = "Unknown Server"
-                actual_tool_name = tool_name
-
-            # Update tool data with clean name
-            clean_tool_data = dict(tool_data)
-            clean_tool_data['name'] = actual_tool_name
-
-            self.add_mcp_tool(clean_tool_data, server_name)
+        metamcp_tools = list(metamcp_tools)
+
+        if len(metamcp_tools) >= _PARALLEL_STANDARDIZE_THRESHOLD:
+            # Each tool standardizes independently, so large corpora
+            # fan out across worker processes and results are appended
+            # back here in input order
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                for tool in executor.map(_build_from_metamcp,
+                                         metamcp_tools, chunksize=64):
+                    self.add_standardized_tool(tool)
+        else:
+            for tool_data in metamcp_tools:
+                self.add_standardized_tool(_build_from_metamcp(tool_data))
+
+def build_standardized(tool_data: Dict[str, Any],
+                       server_name: str = "unknown",
+                       name: Optional[str] = None) -> StandardizedTool:
+    """
+    Build a StandardizedTool from an MCP tool definition
+
+    Pure function with no shared state, so it is safe to run in worker
+    processes during bulk ingestion.
+
+    Args:
+        tool_data: MCP tool definition dict with 'name', 'description', 'inputSchema'
+        server_name: Name of the source MCP server
+        name: Override for the tool name, used when the caller has already
+            stripped a server prefix and wants to avoid copying tool_data
+
+    Returns:
+        StandardizedTool object
+    """
+    if name is None:
+        name = tool_data.get('name', 'unnamed_tool')
+    base_description = tool_data.get('description', 'No description provided')
+    input_schema = tool_data.get('inputSchema', {})
+
+    # Enhance description for better semantic retrieval
+    enhanced_description = ToolStandardizer._enhance_description(
+        name, base_description, input_schema, server_name
+    )
+
+    return StandardizedTool(
+        name=name,
+        # One shared executor bound per tool name, instead of a new
+        # closure (code object + cell) allocated per tool
+        func=functools.partial(_placeholder_executor, name),
+        description=enhanced_description,
+        original_schema=tool_data,
+        server_source=server_name
+    )
+
+# Tools from the same server share one interned display name instead of
+# each carrying its own freshly built string (per worker process)
+_server_name_cache: Dict[str, str] = {}
+
+def _build_from_metamcp(tool_data: Dict[str, Any]) -> StandardizedTool:
+    """Split the metaMCP server prefix off a tool name and standardize it"""
+    tool_name = tool_data.get('name', '')
+    prefix, sep, actual_tool_name = tool_name.partition('__')
+    if sep:
+        server_name = _server_name_cache.get(prefix)
+        if server_name is None:
+            server_name = sys.intern(prefix.replace('_', ' ').title())
+            _server_name_cache[prefix] = server_name
+    else:
+        server_name = "Unknown Server"
+        actual_tool_name = tool_name
+
+    # Pass the clean name as an override rather than copying tool_data
+    # just to rewrite one key; the original (prefixed) definition is kept
+    # as the tool's schema
+    return build_standardized(tool_data, server_name, name=actual_tool_name)
 
 # Example usage and sample tools for testing
 def create_sample_tools() -> List[StandardizedTool]:
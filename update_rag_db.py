@@ -52,26 +52,27 @@ def main():
     # Clear existing collection and add test tools
     try:
         # Clear the collection
-        retriever.vectorstore._collection.delete()
+        vector_store = retriever._load_vector_store()
+        vector_store._collection.delete()
         print("✓ Cleared existing tool collection")
 
         # Standardize and add test tools
-        standardized_tools = [standardizer.standardize_tool(tool) for tool in test_tools]
+        for tool in test_tools:
+            standardizer.add_mcp_tool(tool, server_name="test")
 
-        # Add to vector database
-        for tool in standardized_tools:
-            document_text = f"{tool['name']}: {tool['description']}"
-            retriever.vectorstore.add_texts(
-                texts=[document_text],
-                metadatas=[tool],
-                ids=[tool['name']]
-            )
+        # Add to vector database in one call so the embedding model runs
+        # a single batched forward pass instead of one per tool
+        texts = standardizer.get_tool_descriptions()
+        metadatas = standardizer.get_tool_metadata()
+        ids = [meta['name'] for meta in metadatas]
+
+        vector_store.add_texts(texts=texts, metadatas=metadatas, ids=ids)
 
         print(f"✓ Added {len(test_tools)} test tools to RAG database")
 
         # Test the database
         test_query = "calculate mathematical expressions"
-        results = retriever.vectorstore.similarity_search(test_query, k=3)
+        results = vector_store.similarity_search(test_query, k=3)
         print(f"✓ Test query '{test_query}' returned {len(results)} results")
         for result in results:
             print(f"  - {result.metadata.get('name', 'Unknown')}: {result.page_content}")